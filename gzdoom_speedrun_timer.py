@@ -2,14 +2,22 @@
 "A speedrun timer for gzdoom"
 # I avoided using the word "map" for maps and instead called them "levels" since map is a default function in python
 
-import os, json, bz2
-from sys import argv
-from math import floor
-from datetime import datetime, timedelta
+import os, re, bz2, selectors
+from sys import argv, intern, stderr
+from time import perf_counter_ns
+from datetime import timedelta
+from functools import lru_cache
+from collections import defaultdict
 from subprocess import Popen, PIPE
 from threading import Thread
+from concurrent.futures import ThreadPoolExecutor
 
 from PyQt5 import QtWidgets, QtCore, QtGui
+import zstandard
+try:
+    import orjson
+except ImportError: # orjson is optional, the standard library json is slower but works the same for our data
+    import json as orjson
 
 from mainwindow import Ui_MainWindow
 
@@ -22,8 +30,113 @@ class SerializedEmpty(Exception):
     "You tried to serialize a Level or Chapter that has no data to be saved."
 
 
+# The title of every level as the game shows it: _LEVEL_NAMES[chapter_number-1][level_number-1]
+_LEVEL_NAMES = (('Hangar', # index 0 is chapter 1
+                'Nuclear Plant',
+                'Toxin Refinery',
+                'Command Control',
+                'Phobos Lab',
+                'Central Processing',
+                'Computer Station',
+                'Phobos Anomaly',
+                'Military Base'),
+                ('Deimos Anomaly', # chapter 2
+                'Containment Area',
+                'Refinery',
+                'Deimos Lab',
+                'Command Center',
+                'Halls of The Damned',
+                'Spawning Vats',
+                'Tower of Babel',
+                'Fortress of Mystery'),
+                ('Hell Keep', # chapter 3
+                'Slough of Despair',
+                'Pandemonium',
+                'House of Pain',
+                'Unholy Cathedral',
+                'Mt. Erebus',
+                'Limbo', # shown as "Gate To Limbo" on the score screen
+                'Dis',
+                'Warrens'),
+                ('Hell Beneath', # chapter 4
+                'Perfect Hatred',
+                'Sever the Wicked',
+                'Unruly Evil',
+                'They Will Repent',
+                'Against Thee Wickedly',
+                'And Hell Followed',
+                'Unto the Cruel',
+                'Fear'),
+                ('Entryway', # chapter 5 is Doom2
+                'Underhalls',
+                'The Gantlet',
+                'The Focus',
+                'The Waste Tunnels',
+                'The Crusher',
+                'Dead Simple',
+                'Tricks and Traps',
+                'The Pit',
+                'Refueling Base',
+                '"O" of Destruction!', # doom calls it this while the title screen calls it "Circle of Death"
+                'The Factory',
+                'Downtown',
+                'The Inmost Dens',
+                'Industrial Zone',
+                'Suburbs',
+                'Tenements',
+                'The Courtyard',
+                'The Citadel',
+                'Gotcha!',
+                'Nirvana',
+                'The Catacombs',
+                "Barrels o' Fun",
+                'The Chasm',
+                'Bloodfalls',
+                'The Abandoned Mines',
+                'Monster Condo',
+                'The Spirit World',
+                'The Living End',
+                'Icon of Sin',
+                'Wolfenstein',
+                'Grosse'))
+
+# These are filled once at import by _build_level_meta() so Levels and Chapters don't have to work this out every time one is created.
+_LEVEL_META = {} # {code: (chapter_number, level_number, name, secret, secret_exit, final)} for every level in the game
+_CHAPTER_CODES = {} # {chapter_number: (code, ...)} every level code in a chapter, in order
+
+_MICROSECOND = timedelta(microseconds=1) # personal bests are saved as a whole number of microseconds
+
+
+@lru_cache(maxsize=2048)
+def _format_time(delta: timedelta) -> str:
+    """
+    Convert timedelta into a pretty string that looks like 02:04.60. Use LevelChapter.pretty_time rather than calling this directly.
+    The same times get formatted over and over every time the table is drawn, so the results are cached.
+    """
+    # a microsecond is 1/1,000,000th of a second, one millionth. Round to the nearest hundredth of a second
+    # before splitting it up so 59.996 seconds carries over to 01:00.00 instead of showing 00:59.100
+    return _format_centiseconds((delta.seconds*1_000_000 + delta.microseconds + 5000) // 10000)
+
+
+def _fast_pretty_centi(nanoseconds: int) -> str:
+    """
+    Convert a number of nanoseconds into a pretty string that looks like 02:04.60, the same as _format_time.
+    This is for the running lcd timer, every value is only shown once so there's no point going through a timedelta or the cache.
+    """
+    return _format_centiseconds((nanoseconds + 5_000_000) // 10_000_000) # round to the nearest hundredth of a second
+
+
+def _format_centiseconds(centiseconds: int) -> str:
+    "Helper function to turn a whole number of hundredths of a second into 02:04.60 for _format_time and _fast_pretty_centi."
+    seconds, centiseconds = divmod(centiseconds, 100)
+    minutes, seconds = divmod(seconds, 60)
+    return "%02d:%02d.%02d" % (minutes, seconds, centiseconds)
+
+
 class LevelChapter():
     "Base class of both Levels and Chapters."
+    # Declaring every attribute keeps these objects small and their attribute access fast, there are thousands of them in a RecordHolder.
+    __slots__ = ("session_time", "personal_best", "diff", "modified", "_orig_pb", "_backup_pb", "_backup_session_time", "color_pb")
     def __init__(self, personal_best: timedelta=None):
         """
         name is a str: The normal name of the level or chapter: "Hangar" or "Knee-Deep In The Dead"
@@ -40,11 +153,11 @@ class LevelChapter():
         self._orig_pb = personal_best # This is used in case the user reverts back and forth.
         # It allows us to tell if this modified LevelChapter is unmodified again
         self._backup_pb = self._backup_session_time = None # The values we revert to if the user reverts
+        self.color_pb = () # personal bests set this session that the table draws gold, filled in by QChapter
 
     def pretty_time(self, delta: timedelta) -> str:
         "Convert timedelta into a pretty string that looks like 02:04.60"
-        # a microsecond is 1/1,000,000th of a second, one millionth
-        return "".join((str(floor(delta.seconds/60)).zfill(2), ":", str(delta.seconds%60).zfill(2), ".", str(round(delta.microseconds*.0001)).rjust(2, "0")))
+        return _format_time(delta)
 
     def revert_session_time(self) -> None:
         "Revert the session time to the last time stored."
@@ -62,13 +175,13 @@ class LevelChapter():
 
     def delete_session_time(self) -> None:
         "Delete the session time."
-        if self.session_time: # don't back up a blank session time, keep whatever last value was stored.
+        if self.session_time is not None: # don't back up a blank session time, keep whatever last value was stored.
             self._backup_session_time = self.session_time
             self.session_time = None
 
     def delete_personal_best(self) -> None:
         "Delete the personal best time."
-        if self.personal_best:
+        if self.personal_best is not None:
             self._backup_pb = self.personal_best
             self.personal_best = None
 
@@ -97,75 +210,8 @@ class LevelChapter():
 
 class Level(LevelChapter):
     "A single doom level."
-    _doom1_secret_exits = (3, 5, 6, 2) # level numbers used to set flags upon level creation
-    _level_names = [['Hangar', # index 0 is chapter 1
-                    'Nuclear Plant',
-                    'Toxin Refinery',
-                    'Command Control',
-                    'Phobos Lab',
-                    'Central Processing',
-                    'Computer Station',
-                    'Phobos Anomaly',
-                    'Military Base'],
-                    ['Deimos Anomaly', # chapter 2
-                    'Containment Area',
-                    'Refinery',
-                    'Deimos Lab',
-                    'Command Center',
-                    'Halls of The Damned',
-                    'Spawning Vats',
-                    'Tower of Babel',
-                    'Fortress of Mystery'],
-                    ['Hell Keep', # chapter 3
-                    'Slough of Despair',
-                    'Pandemonium',
-                    'House of Pain',
-                    'Unholy Cathedral',
-                    'Mt. Erebus',
-                    'Limbo', # shown as "Gate To Limbo" on the score screen
-                    'Dis',
-                    'Warrens'],
-                    ['Hell Beneath', # chapter 4
-                    'Perfect Hatred',
-                    'Sever the Wicked',
-                    'Unruly Evil',
-                    'They Will Repent',
-                    'Against Thee Wickedly',
-                    'And Hell Followed',
-                    'Unto the Cruel',
-                    'Fear'],
-                    ['Entryway', # chapter 5 is Doom2
-                    'Underhalls',
-                    'The Gantlet',
-                    'The Focus',
-                    'The Waste Tunnels',
-                    'The Crusher',
-                    'Dead Simple',
-                    'Tricks and Traps',
-                    'The Pit',
-                    'Refueling Base',
-                    '"O" of Destruction!', # doom calls it this while the title screen calls it "Circle of Death"
-                    'The Factory',
-                    'Downtown',
-                    'The Inmost Dens',
-                    'Industrial Zone',
-                    'Suburbs',
-                    'Tenements',
-                    'The Courtyard',
-                    'The Citadel',
-                    'Gotcha!',
-                    'Nirvana',
-                    'The Catacombs',
-                    "Barrels o' Fun",
-                    'The Chasm',
-                    'Bloodfalls',
-                    'The Abandoned Mines',
-                    'Monster Condo',
-                    'The Spirit World',
-                    'The Living End',
-                    'Icon of Sin',
-                    'Wolfenstein',
-                    'Grosse']]
+    _doom1_secret_exits = (3, 5, 6, 2) # level numbers used to set secret flags in _build_level_meta
+    __slots__ = ("code", "chapter_name", "chapter_number", "level_number", "name", "secret", "secret_exit", "final", "_race_start")
 
     def __init__(self, code: str, personal_best: timedelta=None):
         """
@@ -183,58 +229,26 @@ class Level(LevelChapter):
         self.modified bool: whether or not this level's personal_best needs to be saved.
         """
         super().__init__(personal_best)
-        self.code = code
-        self.secret_exit = False
-        self.secret = False
+        self.code = intern(code) # codes are compared when validating a chapter sequence, interned strings compare by identity
         self.chapter_name = RecordHolder.get_chapter_name_by_code(code)
-        self.final = False
-
-        # set chapter_number, level_number, secret, secret_exit
-        match self.code[0]:
-
-            case "E": # doom1 E1M1 format
-                self.chapter_number = int(self.code[1])
-                self.level_number = int(self.code[3])
-                if self.level_number == 9: # all secret levels in chapters 1-3 are number 9
-                    # set the return back to normal levels to be one more than the secret_exit
-                    self.secret = f"E{self.chapter_number}M{self._doom1_secret_exits[self.chapter_number-1]+1}"
-                elif self.level_number == self._doom1_secret_exits[self.chapter_number-1]: #
-                    self.secret_exit = f"E{self.chapter_number}M9" # again, all doom1 secret exits take you to level 9
-                if self.level_number == 8:
-                    self.final = True
-
-            case "M": # doom 2 MAP01 format
-                self.chapter_number = 5
-                self.level_number = int(self.code[3:])
-                # just set up doom 2's more complicated secret levels as a one-off
-                # one is considered a super-secret level, so one secret level leads to another.
-                match self.level_number:
-                    case 15:
-                        self.secret_exit = "MAP31"
-                    case 31:
-                        self.secret = "MAP16"
-                        self.secret_exit = "MAP32"
-                    case 32:
-                        self.secret = "MAP16"
-                    case 30:
-                        self.final = True
-            case _:
-                raise Exception(f"Unknown level code: {self.code}")
-        self.name = self._level_names[self.chapter_number-1][self.level_number-1]
+        try:
+            self.chapter_number, self.level_number, self.name, self.secret, self.secret_exit, self.final = _LEVEL_META[code]
+        except KeyError:
+            raise Exception(f"Unknown level code: {self.code}")
 
     def __repr__(self):
             return f"Level({self.code}, modified={self.modified})"
 
-    def start_timer(self, start_time: datetime) -> None:
-        "Start recording a speedrun time for this level."
-        self._race_start = start_time
+    def start_timer(self, start_ns: int) -> None:
+        "Start recording a speedrun time for this level. start_ns is a perf_counter_ns() reading."
+        self._race_start = start_ns
 
-    def stop_timer(self, stop_time: datetime) -> bool:
+    def stop_timer(self, stop_ns: int) -> bool:
         """Stop recording a speedrun time for this level.
         Return True if a personal best was set, False if not.
         This method sets this object's self.personal_best, self.session_time, and self.diff"""
         try:
-            self.session_time, self._backup_session_time = (stop_time - self._race_start), self.session_time
+            self.session_time, self._backup_session_time = timedelta(microseconds=(stop_ns - self._race_start) // 1000), self.session_time # nanoseconds to microseconds
         except AttributeError:
             raise RuntimeError("stop_timer called before start_timer was called.")
         self._set_diff()
@@ -248,33 +262,88 @@ class Level(LevelChapter):
         except AttributeError:
             raise RuntimeError("Level.abort_timer called when a timer wasn't started.")
 
-    def get_current_time(self) -> str:
-        """
-        Return how much time has elapsed since the timer was started as a pretty time.
-        Raise RuntimeError if a timer hasn't been started yet.
-        """
-        try:
-            return self.pretty_time(datetime.now() - self._race_start)
-        except AttributeError:
-            raise RuntimeError("get_current_time called before start_timer was called.")
-
     def serialize(self) -> dict:
         "return a serialized version of this object for writing to disk. session_time and diff are omitted."
         try:
-            return {"code": self.code,
-                "pb_seconds": self.personal_best.seconds,
-                "pb_microseconds": self.personal_best.microseconds}
-        except AttributeError: # None.seconds
+            return {"code": self.code, "pb": self.personal_best // _MICROSECOND}
+        except TypeError: # None // timedelta
             raise SerializedEmpty("serialize called with no personal_best set.")
 
 
+def _build_level_meta() -> None:
+    "Fill _LEVEL_META and _CHAPTER_CODES with the information about every level in the game. This is run once at import."
+    for chapter_number in range(1, 6):
+        if chapter_number < 5: # doom1 E1M1 format
+            codes = tuple(intern(f"E{chapter_number}M{level_number}") for level_number in range(1, 10))
+        else: # doom 2 MAP01 format
+            codes = tuple(intern(f"MAP{str(level_number).zfill(2)}") for level_number in range(1, 33))
+        _CHAPTER_CODES[chapter_number] = codes
+        for level_number, code in enumerate(codes, 1):
+            secret_exit = secret = final = False
+            if chapter_number < 5:
+                if level_number == 9: # all secret levels in chapters 1-4 are number 9
+                    # set the return back to normal levels to be one more than the secret_exit
+                    secret = codes[Level._doom1_secret_exits[chapter_number-1]]
+                elif level_number == Level._doom1_secret_exits[chapter_number-1]:
+                    secret_exit = codes[8] # again, all doom1 secret exits take you to level 9
+                if level_number == 8:
+                    final = True
+            else:
+                # just set up doom 2's more complicated secret levels as a one-off
+                # one is considered a super-secret level, so one secret level leads to another.
+                match level_number:
+                    case 15:
+                        secret_exit = codes[30] # MAP31
+                    case 31:
+                        secret = codes[15] # MAP16
+                        secret_exit = codes[31] # MAP32
+                    case 32:
+                        secret = codes[15]
+                    case 30:
+                        final = True
+            _LEVEL_META[code] = (chapter_number, level_number, _LEVEL_NAMES[chapter_number-1][level_number-1], secret, secret_exit, final)
+
+_build_level_meta()
+
+
+class _LazyLevels():
+    """
+    A list of every Level in a chapter that only creates the blank ones the first time they're used.
+    Most chapters in a RecordHolder are never looked at, so this saves creating over a thousand blank Levels at startup.
+    """
+    __slots__ = ("_codes", "_levels")
+    def __init__(self, codes: tuple, levels: list=None):
+        "codes is every level code in the chapter in order. levels is a list of Level objects that already exist."
+        self._codes = codes
+        self._levels = [None] * len(codes)
+        for level in levels or ():
+            self._levels[level.level_number-1] = level
+
+    def __len__(self):
+        return len(self._codes)
+
+    def __getitem__(self, index: int) -> Level:
+        level = self._levels[index] # raises IndexError past the last level like a list would
+        if level is None:
+            level = self._levels[index] = Level(self._codes[index])
+        return level
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self._codes)))
+
+    def created(self):
+        "Return an iterator of only the levels that have been created. Levels that were never used have nothing worth looking at."
+        return (level for level in self._levels if level is not None)
+
+
 class Chapter(LevelChapter):
     "A single doom chapter. Contains Level objects."
+    __slots__ = ("chapter_number", "name", "levels", "_valid_sequence", "_previous_level", "_current_level")
     def __init__(self, chapter_number: int, levels: list=None, personal_best: timedelta=None):
         """
         chapter_number is the chapter number from the code, for example E1M1 -> 1.
         levels is a list of Level objects.
-            If a level is missing from that list, a blank one will be created.
+            If a level is missing from that list, a blank one will be created the first time it's used.
         session_time and personal_best refer to times for the entire chapter when run in order.
 
         name str: The name of the chapter like "Knee-Deep In The Dead".
@@ -285,23 +354,7 @@ class Chapter(LevelChapter):
         self.chapter_number = chapter_number
         self.name = RecordHolder.get_chapter_name_by_number(chapter_number)
 
-        # set self.levels: a list of level objects for the entire chapter.
-        if levels:
-            self.levels = levels
-            # Now create blank Level objects for the ones not provided by levels
-            if self._is_doom1():
-                for i in range(1, 10):
-                    if self.levels[i-1].level_number != i:
-                        self.levels.insert(i, Level(f"E{chapter_number}M{i}"))
-            else: # doom2
-                for i in range(1, 33):
-                    if self.levels[i-1].level_number != i:
-                        self.levels.insert(i, Level(f"MAP{str(i).zfill(2)}"))
-        else: # levels was blank, fill self.levels with all blank objects
-            if self._is_doom1():
-                self.levels = [Level(f"E{chapter_number}M{level_number}") for level_number in range(1, 10)]
-            else: # doom2
-                self.levels = [Level(f"MAP{str(level_number).zfill(2)}") for level_number in range(1, 33)]
+        self.levels = _LazyLevels(_CHAPTER_CODES[chapter_number], levels) # every level object for the entire chapter.
 
         self._valid_sequence = False # whether or not this chapter is being run in order from first level to last
         self._previous_level = None # used for the same task
@@ -309,29 +362,33 @@ class Chapter(LevelChapter):
     def __repr__(self):
         return f"Chapter({self.chapter_number}, modified={self.modified})"
 
-    def start_timer(self, start_time: datetime, code: str) -> Level:
-        "Start the timer for the contained level by code."
+    def start_timer(self, start_ns: int, code: str) -> Level:
+        "Start the timer for the contained level by code. start_ns is a perf_counter_ns() reading."
         self._current_level = self._get_level(code)
-        self._current_level.start_timer(start_time)
+        self._current_level.start_timer(start_ns)
         # figure out if the sequence is valid.
         if self._current_level.level_number == 1: # User started from the first level.
             self._valid_sequence = True
             self._previous_level = None
         elif self._valid_sequence: # User is on another level and the sequence has been good so far.
+            previous = self._previous_level
+            if previous is None: # No level has been finished since the first one was started, so treat it as the previous level.
+                previous_number, previous_secret_exit, previous_secret = 1, None, None
+            else:
+                previous_number, previous_secret_exit, previous_secret = previous.level_number, previous.secret_exit, previous.secret
             # User went from one level to one out of order, figure out if it's because of a secret level.
-            if self._current_level.level_number != getattr(self._previous_level, "level_number", 1)+1:
+            if self._current_level.level_number != previous_number+1:
                 # If the current level is NOT the secret from the previous or
                 # if the previous level was NOT a secret and now we're back to the normal levels...
-                if self._current_level.code not in (getattr(self._previous_level, "secret_exit", None),
-                                                    getattr(self._previous_level, "secret", None)):
+                if self._current_level.code not in (previous_secret_exit, previous_secret):
                     self._valid_sequence = False
                 # else it was a proper secret path, _valid_sequence remains True
             # else the level_numbers have been sequential so we leave _valid_sequence set True
         return self._current_level
 
-    def stop_timer(self, stop_time: datetime) -> dict:
+    def stop_timer(self, stop_ns: int) -> dict:
         """
-        Stop the timer for the currently active level.
+        Stop the timer for the currently active level. stop_ns is a perf_counter_ns() reading.
         Return a dict with the following values:
             {"level": Level,
             "is_level_pb": bool,
@@ -340,10 +397,15 @@ class Chapter(LevelChapter):
         """
         level = self._current_level
         del self._current_level
-        is_level_pb = level.stop_timer(stop_time)
+        is_level_pb = level.stop_timer(stop_ns)
         if level.final and self._valid_sequence:
             self._backup_session_time = self.session_time
-            self.session_time = timedelta(seconds=sum(session_time.total_seconds() for session_time in [x.session_time for x in self.levels if x.session_time]))
+            # add up the level times as whole microseconds, total_seconds() goes through a float and loses precision
+            total_microseconds = 0
+            for x in self.levels.created():
+                if (session_time := x.session_time) is not None:
+                    total_microseconds += (session_time.days*86400 + session_time.seconds)*1_000_000 + session_time.microseconds
+            self.session_time = timedelta(microseconds=total_microseconds)
             is_chapter_session = True
             self._set_diff()
             is_chapter_pb = self._is_session_pb()
@@ -363,55 +425,76 @@ class Chapter(LevelChapter):
         self._previous_level = None
         self._valid_sequence = False
 
-    def get_current_time(self) -> str:
-        """
-        Get the current elapsed time of the currently running level as a pretty_time.
-        This must be run after start_timer and before stop_timer.
-        No datetime arguments here as this for looks only and can be inaccurate.
-        """
-        try:
-            return self._current_level.get_current_time()
-        except AttributeError:
-            raise RuntimeError(f"Chapter({self.chapter_number}).get_current_time: _current_level doesn't exist.")
-
     def is_modified(self) -> bool:
         "Return True if this chapter or any of it's levels have been modified."
         if self.modified:
             return True
-        for level in self.levels:
+        for level in self.levels.created():
             if level.modified:
                 return True
         return False
 
     def serialize(self) -> dict:
         "Serialize this chapter and the contained levels. If the chapter or it's levels have no personal_best, None is returned."
-        serialized_levels = [x.serialize() for x in self.levels if x.personal_best]
-        if not self.personal_best and not serialized_levels:
+        serialized_levels = [x.serialize() for x in self.levels.created() if x.personal_best is not None]
+        if self.personal_best is None and not serialized_levels:
             raise SerializedEmpty(f"Attempted to serialize empty Chapter({self.chapter_number})")
         return {"chapter_number": self.chapter_number,
-                "pb_seconds": getattr(self.personal_best, "seconds", None),
-                "pb_microseconds": getattr(self.personal_best, "microseconds", None),
+                "pb": self.personal_best // _MICROSECOND if self.personal_best is not None else None,
                 "levels": serialized_levels}
 
     def _get_level(self, code: str) -> Level:
-        "return this chapter's level that corresponds with code."
-        if self.chapter_number != RecordHolder.get_chapter_number_by_code(code):
+        """
+        return this chapter's level that corresponds with code.
+        Raise KeyError if code isn't a level in doom or doom 2, like SIGIL's E5M1 or MAP33.
+        Raise WrongChapter if it is a level, but in another chapter.
+        """
+        try:
+            chapter_number, level_number = _LEVEL_META[code][:2]
+        except KeyError:
+            raise KeyError(f"Unknown level code: {code}")
+        if self.chapter_number != chapter_number:
             raise WrongChapter(f"{code=}, {self=}")
-        if self._is_doom1():
-            return self.levels[int(code.split("M")[1])-1]
-        else: # doom2
-            return self.levels[int(code.split("MAP")[1])-1]
-
-    def _is_doom1(self) -> bool:
-        "Return True if this is a doom1 chapter, False if it's doom2"
-        return self.chapter_number < 5
+        return self.levels[level_number-1]
+
+
+# The chapter lookups below are called every time a Level or Chapter is created and every time a level is started.
+# They only ever get a handful of different arguments so their results are cached.
+@lru_cache(maxsize=None)
+def _get_chapter_name_by_code(code: str) -> str:
+    "Get a chapter name from a code."
+    return RecordHolder.chapter_names[_get_chapter_number_by_code(code)-1]
+
+@lru_cache(maxsize=None)
+def _get_chapter_name_by_number(number: int) -> str:
+    "get a chapter name from a chapter number. Doom2 is considered chapter 5."
+    return RecordHolder.chapter_names[number-1]
+
+@lru_cache(maxsize=None)
+def _get_chapter_number_by_code(code: str) -> int:
+    "Get a chapter number from a code."
+    if code[0] == "E": # doom1 style E1M1
+        return int(code[1])
+    return 5 # assume doom2
+
+@lru_cache(maxsize=None)
+def _get_chapter_number_by_name(name: str) -> int:
+    """
+    Get the chapter number that name refers to.
+    get_chapter_number_by_name("Inferno") -> 3
+    If the chapter isn't found, raise KeyError.
+    """
+    try:
+        return RecordHolder.chapter_names.index(name)+1
+    except ValueError:
+        raise KeyError(name)
 
 
 class RecordHolder():
     """
     This object stores information about every category, difficulty, chapter, and level in the game.
     It also holds a database of all levels and their speedrun times.
-    The class methods can be used directly rather than have an object created from it.
+    The static methods can be used directly rather than have an object created from it.
     When a "code" is referred to, this is a str like "E1M1" for Doom1, "MAP01" for Doom2.
     RecordHolder is a play on words, get it?
     """
@@ -423,43 +506,13 @@ class RecordHolder():
 
     def __init__(self, serialized: dict):
         "serialized is a dict of data from the FileDude, see it's documentation for more info."
-        # create the nested dict structure of the database and fill it with blank Chapter and Level objects.
-        self._db = dict.fromkeys(self.categories)
-        for category in self.categories:
-            self._db[category] = dict.fromkeys(self.difficulties)
-            for difficulty in self.difficulties:
-                self._db[category][difficulty] = []
-                for chapter_number in range(1, 6):
-                    if not serialized.get(category) or not serialized[category].get(difficulty): # if serialized has no category or difficulty...
-                        # stuff serialized with an empty list so the next block of code works
-                        serialized[category] = {k: [] for k in self.difficulties}
-                    for chapter in serialized[category][difficulty]:
-                        if chapter["chapter_number"] == chapter_number: # If the current chapter is in serialized...
-                            try:
-                                chapter_personal_best = timedelta(seconds=chapter["pb_seconds"], microseconds=chapter["pb_microseconds"])
-                            except TypeError:
-                                chapter_personal_best = None
-                            levels = []
-                            if chapter["chapter_number"] < 5: # if doom1
-                                for i in range(1, 10):
-                                    for level in chapter["levels"]:
-                                        if i == int(level["code"][3]): # found the level
-                                            levels.insert(i-1, Level(level["code"], personal_best=timedelta(seconds=level["pb_seconds"], microseconds=level["pb_microseconds"])))
-                                            break
-                                    else: # the level wasn't found in  serialized so add a blank one.
-                                        levels.insert(i-1, Level(f"E{chapter_number}M{i}"))
-                            else: # doom2
-                                for i in range(1, 33):
-                                    for level in chapter["levels"]:
-                                        if i == int(level["code"][3:]): # found the level
-                                            levels.insert(i-1, Level(level["code"], personal_best=timedelta(seconds=level["pb_seconds"], microseconds=level["pb_microseconds"])))
-                                            break
-                                    else: # the level wasn't found in  serialized so add a blank one.
-                                        levels.insert(i-1, Level(level["code"]))
-                            self._db[category][difficulty].insert(chapter_number-1, Chapter(chapter["chapter_number"], levels, personal_best=chapter_personal_best))
-                            break
-                    else: # chapter wasn't found in serialized, create a blank one
-                        self._db[category][difficulty].insert(chapter_number-1, Chapter(chapter_number))
+        # Fill in the categories and difficulties that serialized doesn't have, without changing the dict we were given.
+        serialized = {category: {difficulty: serialized.get(category, {}).get(difficulty, []) for difficulty in self.difficulties} for category in self.categories}
+        # create the nested dict structure of the database and fill it with Chapter and Level objects.
+        self._db = {category: {difficulty: self._build_chapters(serialized[category][difficulty]) for difficulty in self.difficulties} for category in self.categories}
+        # {(category, difficulty, chapter_name): Chapter} chapters that get_chapter has already found.
+        # The Chapters in _db are only ever changed in place, never replaced, so this never needs clearing.
+        self._chapter_cache = {}
 
     def __repr__(self):
         return "RecordHolder()"
@@ -473,55 +526,61 @@ class RecordHolder():
         Return the chapter object for a given category, difficulty, and name.
         If the chapter isn't found, raise KeyError.
         """
-        return self._db[category][difficulty][self.get_chapter_number_by_name(chapter_name)-1]
-
-    @classmethod
-    def get_chapter_name_by_code(cls, code: str) -> str:
-        "Get a chapter name from a code."
-        try:
-            return cls.chapter_names[int(code[1])-1] # doom1 style
-        except ValueError: # int("A") so doom2 is being played
-            return cls.chapter_names[4] # doom2 style
-
-    @classmethod
-    def get_chapter_name_by_number(cls, number: int) -> str:
-        "get a chapter name from a chapter number. Doom2 is considered chapter 5."
-        return cls.chapter_names[number-1]
-
-    @classmethod
-    def get_chapter_number_by_code(cls, code: str) -> int:
-        "Get a chapter number from a code."
+        key = (category, difficulty, chapter_name)
         try:
-            return int(code[1]) # doom1
-        except ValueError:
-            return 5 # assume doom2
-
-    @classmethod
-    def get_chapter_number_by_name(cls, name: str) -> int:
-        """
-        Get the chapter number that name refers to.
-        get_chapter_number_by_name("Inferno") -> 3
-        If the chapter isn't found, raise KeyError.
-        """
-        try:
-            return cls.chapter_names.index(name)+1
-        except ValueError:
-            raise KeyError(name)
+            return self._chapter_cache[key]
+        except KeyError:
+            chapter = self._chapter_cache[key] = self._db[category][difficulty][self.get_chapter_number_by_name(chapter_name)-1]
+            return chapter
+
+    def _build_chapters(self, serialized_chapters: list) -> list:
+        "Helper method to return a list of all 5 Chapters for one category and difficulty from a list of serialized chapters."
+        # index the serialized chapters by number so each one is only looked up once
+        serialized_chapters = {chapter["chapter_number"]: chapter for chapter in serialized_chapters}
+        return [self._build_chapter(serialized_chapters.get(chapter_number), chapter_number) for chapter_number in range(1, 6)]
+
+    def _build_chapter(self, chapter: dict or None, chapter_number: int) -> Chapter:
+        "Helper method to create a Chapter from it's serialized dict. If chapter is None, it wasn't found in serialized so a blank one is created."
+        if chapter is None:
+            return Chapter(chapter_number)
+        chapter_personal_best = timedelta(microseconds=chapter["pb"]) if chapter["pb"] is not None else None
+        # The Chapter puts each level in it's place. Levels that weren't found in serialized are created by the Chapter when they're used.
+        levels = [Level(level["code"], personal_best=timedelta(microseconds=level["pb"])) for level in chapter["levels"]]
+        return Chapter(chapter_number, levels, personal_best=chapter_personal_best)
+
+    # These are module level functions so they can be cached with lru_cache, they're kept here so they can still be used as RecordHolder.get_...
+    get_chapter_name_by_code = staticmethod(_get_chapter_name_by_code)
+    get_chapter_name_by_number = staticmethod(_get_chapter_name_by_number)
+    get_chapter_number_by_code = staticmethod(_get_chapter_number_by_code)
+    get_chapter_number_by_name = staticmethod(_get_chapter_number_by_name)
 
 
 class FileDude():
     """
     Saves and loads information from disk.
+    The file is json compressed with zstandard. Files from older versions compressed with bz2 are still loaded and get rewritten as zstandard on the next save.
     The format of the dict of serialized data is a heirarchy of dicts:
     data[runs][category][difficulty][Chapter(1), ..., Chapter(5)]
+    Personal bests are saved as a whole number of microseconds: {"chapter_number": 1, "pb": 90396000, "levels": [{"code": "E1M1", "pb": 10000000}, ...]}
     Note that only Levels and Chapters with personal_best times will be saved and loaded.
     """
+    _bz2_magic = b"BZh" # the first bytes of every bz2 file, used to detect a save from an older version
+    _version = 2 # the version of the save format. Version 1 had no version number and saved pb_seconds and pb_microseconds separately
     def __init__(self, save_file: str=None):
         "save_file is the path to the file to save and load. If unset, a default location is used."
         if save_file:
             self.config_file = save_file
+            self._legacy_file = None
         else:
-            self.config_file = os.path.join(os.environ["HOME"], ".config", "gzdoom", "speedrun.json.bz2")
+            config_dir = os.path.join(os.environ["HOME"], ".config", "gzdoom")
+            self.config_file = os.path.join(config_dir, "speedrun.json.zst")
+            self._legacy_file = os.path.join(config_dir, "speedrun.json.bz2") # where older versions saved to
+        self._migrate = False # whether the loaded file was saved by an older version and needs to be rewritten
+        # Compressing and writing the file happens in this one thread, so saves never overlap and are written in the order they were made.
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="FileDude")
+        # The last payload given to the _writer, or None if nothing has been written since loading.
+        # Once something's been written, what's on disk is compared against this instead of what was loaded.
+        self._written_payload = None
 
     def load(self) -> dict:
         """
@@ -530,29 +589,62 @@ class FileDude():
         If no file was found, return an empty dict.
         """
         try:
-            d = json.loads(bz2.open(self.config_file, "rt").read())
+            d = orjson.loads(self._read_decompressed())
         except FileNotFoundError: # No config file found, starting fresh.
             self._old_gui_config = {}
             return {}
         else:
             self._old_gui_config = d["gui_config"]
+            if d.get("version", 1) < self._version:
+                self._migrate = True
+                self._upgrade_v1(d["runs"])
             return d["runs"]
 
     def save(self, runs: dict, gui_config: dict) -> None:
         """
-        Serialize and save data to disk.
+        Serialize and save data to disk, waiting until it's written.
         runs is a dict of Chapters. If none of the runs were modified, runs should an empty dict or None.
         gui_config is a dict of configuration options from the MainWindow.
         """
+        if (payload := self._serialize(runs, gui_config)) is not None:
+            self._writer.submit(self._write, payload).result() # waits for any save_async before it too, and raises if writing failed
+
+    def save_async(self, runs: dict, gui_config: dict) -> None:
+        """
+        Like save, but only serialize here and compress and write the file in the background so the gui isn't held up.
+        The runs are serialized before returning, so they can be changed right away without affecting what gets written.
+        If the write fails it's reported on stderr and the next save writes everything again.
+        """
+        if (payload := self._serialize(runs, gui_config)) is not None:
+            self._writer.submit(self._write, payload).add_done_callback(self._async_save_done)
+
+    def close(self) -> None:
+        "Wait for any saves still being written to finish. Call this before exiting."
+        self._writer.shutdown(wait=True)
+
+    def get_gui_config(self) -> dict:
+        "return the stored gui_config"
+        return self._old_gui_config
+
+    def _upgrade_v1(self, runs: dict) -> None:
+        "Helper method to convert runs loaded from a version 1 save to the current format in place."
+        for difficulties in runs.values():
+            for chapters in difficulties.values():
+                for chapter in chapters:
+                    seconds, microseconds = chapter.pop("pb_seconds"), chapter.pop("pb_microseconds")
+                    chapter["pb"] = seconds*1_000_000 + microseconds if seconds is not None else None
+                    for level in chapter["levels"]:
+                        level["pb"] = level.pop("pb_seconds")*1_000_000 + level.pop("pb_microseconds")
+
+    def _serialize(self, runs: dict, gui_config: dict) -> bytes or None:
+        "Helper method to return what save writes to disk as uncompressed json, or None if nothing was modified so there's nothing to write."
         try:
-            modified = gui_config != self._old_gui_config
+            modified = gui_config != self._old_gui_config or self._migrate
         except AttributeError: # First run, no previous gui_config to compare
             modified = True
 
-        serialized = {"gui_config": gui_config, # gui config is already a serialized dict
-                      "runs": {}}
-
-        for category in runs: # for each chapter in the passed in data...
+        serialized_runs = defaultdict(lambda: defaultdict(list)) # only categories and difficulties with something to save end up in here
+        for category in runs or {}: # for each chapter in the passed in data...
             for difficulty in runs[category]:
                 for chapter in runs[category][difficulty]:
                     try:
@@ -562,20 +654,62 @@ class FileDude():
                     else:
                         if not modified:
                             modified = chapter.is_modified()
-                        try: # try to add this chapter with an already existing dict structure
-                            serialized["runs"][category][difficulty].append(seralized_chapter)
-                        except KeyError: # back up one element at a time and try to create it, here we do the difficulty
-                            try:
-                                serialized["runs"][category] = {difficulty: [seralized_chapter]}
-                            except KeyError: # create the category
-                                serialized["runs"] = {category: {difficulty: [seralized_chapter]}}
-
-        if modified: # don't actually write anything if nothing was modified
-            bz2.open(self.config_file, 'wt').write(json.dumps(serialized))
-
-    def get_gui_config(self) -> dict:
-        "return the stored gui_config"
-        return self._old_gui_config
+                        serialized_runs[category][difficulty].append(seralized_chapter)
+        serialized = {"version": self._version,
+                      "gui_config": gui_config, # gui config is already a serialized dict
+                      "runs": {category: dict(difficulties) for category, difficulties in serialized_runs.items()}}
+
+        if not modified and self._written_payload is None: # don't actually write anything if nothing was modified since loading
+            return None
+        payload = orjson.dumps(serialized)
+        if isinstance(payload, str): # the standard library json fallback returns str instead of bytes
+            payload = payload.encode("utf-8")
+        if payload == self._written_payload: # it's already been saved, like an autosaved PB that wasn't changed since
+            return None
+        # Something was saved since loading, so modified alone can't be trusted anymore:
+        # reverting an autosaved PB makes it unmodified again even though it's the one on disk.
+        self._written_payload = payload
+        self._migrate = False
+        return payload
+
+    def _async_save_done(self, future) -> None:
+        "Helper method to report a save_async that failed. This runs in the _writer thread."
+        if (error := future.exception()) is not None:
+            self._written_payload = b"" # what's on disk is unknown now, so never match it and always write next time
+            print(f"Saving to {self.config_file} failed: {error!r}", file=stderr)
+
+    def _write(self, payload: bytes) -> None:
+        "Helper method to compress payload into the save file. This runs in the _writer thread."
+        # Write to a temporary file first and only replace the real save once it's safely on disk,
+        # so a crash mid-write can't leave a truncated save behind.
+        tmp_file = self.config_file + ".tmp"
+        with open(tmp_file, "wb") as f:
+            # compress straight into the file rather than building the compressed copy in memory first
+            with zstandard.ZstdCompressor(level=3).stream_writer(f, size=len(payload), closefd=False) as compressor:
+                compressor.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, self.config_file)
+
+    def _read_decompressed(self) -> bytes:
+        """
+        Helper method to return the decompressed contents of the save file.
+        If the save file doesn't exist yet, fall back to the file older versions saved to.
+        Raise FileNotFoundError if neither exist.
+        """
+        try:
+            with open(self.config_file, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            if not self._legacy_file:
+                raise
+            with open(self._legacy_file, "rb") as f:
+                data = f.read()
+        if data.startswith(self._bz2_magic): # saved by an older version, rewrite it as zstandard on the next save
+            self._migrate = True
+            return bz2.decompress(data)
+        # use a stream_reader so a frame written without its decompressed size, like by another zstd tool, can still be read
+        return zstandard.ZstdDecompressor().stream_reader(data).read()
 
 
 class DoomRunner(Thread, QtCore.QObject):
@@ -585,6 +719,17 @@ class DoomRunner(Thread, QtCore.QObject):
     level_started = QtCore.pyqtSignal(dict) # {"code": "E1M1", "name": "Hangar"}
     level_finished = QtCore.pyqtSignal()
     player_died = QtCore.pyqtSignal()
+    # Matches every whole line we care about so a block of output is searched in one go instead of a line at a time.
+    # Each match starts at the newline before the line, re can skip ahead to the next newline much faster than it can try "^" everywhere.
+    # The group that matched says what the line was, level_finished and player_died are named after the signal they emit.
+    # A level declaration like "MAP01 - Entryway" is matched without having to decode every line of output.
+    # Any E#M# or MAP## code is passed on, including ones from outside doom and doom 2 like SIGIL's E5M1 or MAP33,
+    # it's up to MainWindow.level_started to skip the levels we don't keep times for.
+    _event_line = re.compile(rb"\n(?:(?P<level_finished>Starting all scripts of type 13 \(Unloading\))"
+                             rb"|(?P<player_died>Starting all scripts of type 3 \(Death\))"
+                             rb"|(?P<header>-{40})"
+                             rb"|(?P<secret>A secret is revealed!)"
+                             rb"|(?P<level>(?P<code>E\dM\d|MAP\d\d) - (?P<name>.+?)[^\S\n]*))$", re.MULTILINE)
     def __init__(self):
         Thread.__init__(self)
         QtCore.QObject.__init__(self)
@@ -602,174 +747,230 @@ class DoomRunner(Thread, QtCore.QObject):
         #----------------------------------------
 
         self.gzdoom_started.emit()
-        proc = Popen(["stdbuf", "-oL", "gzdoom", "+developer", "3"] + argv[1:], stdout=PIPE)
+        # bufsize=0 since we read the pipe ourselves below, a buffered reader on top of it would never be used
+        proc = Popen(["stdbuf", "-oL", "gzdoom", "+developer", "3"] + argv[1:], stdout=PIPE, bufsize=0)
+        stdout = proc.stdout.fileno()
         header_found = False
         skip_next_header = False
-        while proc.poll() == None:
-            line = proc.stdout.readline()
-            if header_found:
-                if line == b"\n": # This is the blank line between the header and level declaration
+        unfinished_line = b"\n" # the start of a line that gzdoom hasn't finished printing yet, after the newline before it
+        # Wait for output with a selector and read whatever is ready instead of a line at a time, so we can handle lots of lines at once.
+        # The timeout lets us notice gzdoom quitting even if something else is still holding it's output open.
+        with selectors.DefaultSelector() as selector:
+            selector.register(stdout, selectors.EVENT_READ)
+            while True:
+                if not selector.select(timeout=0.25): # nothing to read, check that gzdoom is still running
+                    if proc.poll() is not None:
+                        break
                     continue
-                elif line == b"A secret is revealed!\n":
-                    skip_next_header = True
-                else:
-                    try:
-                        code, name = line.decode("utf-8").strip().split(" - ")
-                    except ValueError: # not enough values to unpack, we didn't get the level info we expected.
-                        continue # just keep trying
-                    self.level_started.emit({"code": code, "name": name})
-                header_found = False
-            elif line == b'Starting all scripts of type 13 (Unloading)\n':
-                self.level_finished.emit()
-            elif line == b'Starting all scripts of type 3 (Death)\n':
-                self.player_died.emit()
-            elif line == b'----------------------------------------\n':
-                if skip_next_header:
-                    skip_next_header = False
-                else:
-                    header_found = True
+                chunk = os.read(stdout, 65536) # read as much as is ready at once since we search the output ourselves
+                if not chunk: # gzdoom closed it's output, it has quit
+                    break
+                output = unfinished_line + chunk
+                end = output.rfind(b"\n") # only search the lines gzdoom has finished printing
+                unfinished_line = output[end:]
+                # Lines that don't match are just debug output we don't care about, so they're skipped without any python code running for them.
+                for event_line in self._event_line.finditer(output, 0, end):
+                    event = event_line.lastgroup
+                    if header_found:
+                        if event == "secret":
+                            skip_next_header = True
+                        elif event == "level":
+                            self.level_started.emit({"code": event_line["code"].decode("ascii"), "name": event_line["name"].decode("utf-8", "replace")})
+                        else: # not the level info we expected after a header
+                            continue # just keep trying
+                        header_found = False
+                    elif event == "header":
+                        if skip_next_header:
+                            skip_next_header = False
+                        else:
+                            header_found = True
+                    elif event in ("level_finished", "player_died"): # a level or secret outside of a header is ignored
+                        getattr(self, event).emit()
+        proc.wait()
         self.gzdoom_quit.emit()
 
 
+class ChapterTableModel(QtCore.QAbstractTableModel):
+    """
+    The table model that shows a Chapter in MainWindow's table: a row for each level and a last row for the complete chapter.
+    Nothing is stored here, the cells are read from the Chapter whenever Qt draws them.
+    Call cells_changed() after changing the times of a level or chapter so the table redraws it.
+    """
+    # These are built once and handed back every time Qt asks for them instead of converting them again for every cell.
+    _pb_brush = QtGui.QBrush(QtGui.QColor.fromRgb(253, 224, 140)) # the background of the cell when a new personal best is set
+    _center_alignment = int(QtCore.Qt.AlignCenter)
+    _no_diff = "+00:00.00" # the diff when session_time and personal_best are the same
+    _headers = ("Level", "Time", "PB", "Diff")
+    _header_tooltips = (None, "Your best time since starting this app.", "Your all-time personal best", "The difference between your time and personal best.")
+    def __init__(self, parent: QtCore.QObject=None):
+        super().__init__(parent)
+        self.chapter = None # the Chapter being shown, the table is empty until set_chapter is called
+        self._header_font = QtGui.QFont()
+        self._header_font.setPointSize(14)
+        self._header_font.setBold(True)
+
+    def set_chapter(self, chapter: Chapter) -> None:
+        "Show chapter in the table."
+        self.beginResetModel()
+        self.chapter = chapter
+        self.endResetModel()
+
+    def get_levelchapter(self, row: int) -> Level or Chapter:
+        "Return the Level shown in row, or the Chapter if row is the complete chapter row."
+        try:
+            return self.chapter.levels[row]
+        except IndexError: # the complete chapter row
+            return self.chapter
+
+    def cells_changed(self, row: int, first_column: int, last_column: int=None, last_row: int=None) -> None:
+        """
+        Tell the table that the cells in row from first_column to last_column have changed so they get redrawn.
+        If last_column is unset, only first_column changed. If last_row is set, every row from row to last_row changed.
+        Changing several cells at once redraws them together.
+        """
+        self.dataChanged.emit(self.index(row, first_column),
+                              self.index(row if last_row is None else last_row, first_column if last_column is None else last_column),
+                              [QtCore.Qt.DisplayRole, QtCore.Qt.BackgroundRole])
+
+    def rowCount(self, parent: QtCore.QModelIndex=QtCore.QModelIndex()) -> int:
+        if parent.isValid() or self.chapter is None:
+            return 0
+        return len(self.chapter.levels) + 1 # +1 for the complete chapter row
+
+    def columnCount(self, parent: QtCore.QModelIndex=QtCore.QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self._headers)
+
+    def data(self, index: QtCore.QModelIndex, role: int=QtCore.Qt.DisplayRole):
+        "Return what Qt needs to draw a cell. Column 0 is the level name, then the session time, personal best, and diff."
+        levelchapter = self.get_levelchapter(index.row())
+        column = index.column()
+        if role == QtCore.Qt.DisplayRole:
+            if column == 0:
+                return levelchapter.name if levelchapter is not self.chapter else "Complete Chapter"
+            elif column == 1:
+                if levelchapter.session_time is not None:
+                    return levelchapter.pretty_time(levelchapter.session_time)
+            elif column == 2:
+                if levelchapter.personal_best is not None:
+                    return levelchapter.pretty_time(levelchapter.personal_best)
+            # the diff is blank if session_time or PB are blank or if they're the same.
+            elif levelchapter.session_time is not None and levelchapter.personal_best is not None and levelchapter.diff != self._no_diff:
+                return levelchapter.diff
+        elif role == QtCore.Qt.TextAlignmentRole:
+            if column != 0: # level name is aligned left
+                return self._center_alignment
+        elif role == QtCore.Qt.BackgroundRole:
+            # personal bests set this session are gold, even if you change chapters or revert back and forth
+            if column == 2 and levelchapter.personal_best in levelchapter.color_pb: # color_pb never holds None
+                return self._pb_brush
+        return None
+
+    def headerData(self, section: int, orientation: QtCore.Qt.Orientation, role: int=QtCore.Qt.DisplayRole):
+        if orientation != QtCore.Qt.Horizontal: # the rows are just numbered
+            return super().headerData(section, orientation, role)
+        if role == QtCore.Qt.DisplayRole:
+            return self._headers[section]
+        elif role == QtCore.Qt.ToolTipRole:
+            return self._header_tooltips[section]
+        elif role == QtCore.Qt.FontRole:
+            return self._header_font
+        return None
+
+
 class QChapter():
     "A Chapter that draws onto MainWindow. Methods with no documentation are just wrappers around Chapter, so check there for more info."
-    _pb_color = QtGui.QColor.fromRgb(253, 224, 140) # the color of the background cell when a new personal best is set
     def __init__(self, chapter: Chapter, window: QtWidgets.QMainWindow):
         self.chapter = chapter
         self.window = window
-        # Fill the QTableWidget immediately
-        window.tableWidget.setRowCount(0)
-        row = 0
-        for level in chapter.levels:
-            window.tableWidget.insertRow(row)
-            window.tableWidget.setItem(row, 0, QtWidgets.QTableWidgetItem(level.name)) # don't use _make_centered_table_item here because we want level.name aligned left
-            if level.session_time:
-                window.tableWidget.setItem(row, 1, self._make_centered_table_item(level.pretty_time(level.session_time)))
-            if level.personal_best:
-                if getattr(level, "color_pb", False) and level.personal_best in level.color_pb:
-                    self._insert_pb_table_item(row, level)
-                else:
-                    window.tableWidget.setItem(row, 2, self._make_centered_table_item(level.pretty_time(level.personal_best)))
-                if level.session_time != level.personal_best:
-                    window.tableWidget.setItem(row, 3, self._make_centered_table_item(level.diff))
-            row += 1
-        # Now add complete chapter to the bottom
-        window.tableWidget.insertRow(row)
-        window.tableWidget.setItem(row, 0, QtWidgets.QTableWidgetItem("Complete Chapter"))
-        if chapter.session_time:
-            window.tableWidget.setItem(row, 1, self._make_centered_table_item(level.pretty_time(chapter.session_time)))
-        if chapter.personal_best:
-            if getattr(chapter, "color_pb", False) and chapter.personal_best in chapter.color_pb:
-                self._insert_pb_table_item(row, chapter)
-            else:
-                window.tableWidget.setItem(row, 2, self._make_centered_table_item(level.pretty_time(chapter.personal_best)))
-            if chapter.session_time != chapter.personal_best:
-                window.tableWidget.setItem(row, 3, self._make_centered_table_item(chapter.diff))
-
-    def start_timer(self, start_time: datetime, code: str) -> None:
-        level = self.chapter.start_timer(start_time, code)
-        window.tableWidget.scrollToItem(window.tableWidget.item(0, level.level_number-1), QtWidgets.QAbstractItemView.PositionAtCenter)
-        #window.tableWidget.selectRow(level.level_number-1) # highlighting the entire row means it doesn't show the PB background color until it's unselected
-        window.tableWidget.setCurrentCell(level.level_number-1, 0)
-
-    def stop_timer(self, stop_time: datetime) -> None:
-        result = self.chapter.stop_timer(stop_time)
+        self.model = window.chapter_model
+        # Show this chapter in the table immediately
+        self.show_in_table()
+
+    def show_in_table(self) -> None:
+        "Show this chapter in the window's table. The table reads everything from the Chapter, so this is all switching back to one takes."
+        self.model.set_chapter(self.chapter)
+
+    def start_timer(self, start_ns: int, code: str) -> None:
+        level = self.chapter.start_timer(start_ns, code)
+        index = self.model.index(level.level_number-1, 0)
+        # Center the level first so making it current doesn't have to scroll to it again
+        self.window.tableWidget.scrollTo(index, QtWidgets.QAbstractItemView.PositionAtCenter)
+        #self.window.tableWidget.selectRow(level.level_number-1) # highlighting the entire row means it doesn't show the PB background color until it's unselected
+        self.window.tableWidget.selectionModel().setCurrentIndex(index, QtCore.QItemSelectionModel.ClearAndSelect)
+
+    def stop_timer(self, stop_ns: int) -> bool:
+        "Stop the timer and show the results in the table. Return True if a level or chapter personal best was set."
+        result = self.chapter.stop_timer(stop_ns)
         level = result["level"]
         # set the lcd to match the final number in case the qtimer ending doesn't line up with us capturing the stop time.
         self.window.lcdNumber.display(level.pretty_time(level.session_time))
         self.window.statusbar.showMessage(f"{level.name} finished.")
 
         # Now show this new run info in the table:
-        # Fill the session time
-        self.window.tableWidget.setItem(level.level_number-1, 1, self._make_centered_table_item(level.pretty_time(level.session_time)))
-        if result["is_level_pb"]: # fill the pb time if it was a pb
-            self._insert_pb_table_item(level.level_number-1, level)
-        self.window.tableWidget.setItem(level.level_number-1, 3, self._make_centered_table_item(level.diff)) # Fill the diff
+        if result["is_level_pb"]:
+            self._color_pb(level)
+        self.model.cells_changed(level.level_number-1, 1, 3) # session time, pb and diff
 
         # Fill the complete chapter time if applicable
         if result["is_chapter_session"]:
             row = len(self.chapter.levels) # rows start at 0
-            self.window.tableWidget.setItem(row, 1, self._make_centered_table_item(level.pretty_time(self.chapter.session_time)))
             if result["is_chapter_pb"]:
-                self._insert_pb_table_item(row, self.chapter)
-            self.window.tableWidget.setItem(row, 3, self._make_centered_table_item(self.chapter.diff))
-            window.tableWidget.setCurrentCell(row, 0)
+                self._color_pb(self.chapter)
+            self.model.cells_changed(row, 1, 3)
+            self.window.tableWidget.setCurrentIndex(self.model.index(row, 0))
+        return result["is_level_pb"] or result["is_chapter_pb"]
 
     def abort_timer(self) -> None:
         "End the timer without scoring it. This is used when the player dies or the game is closed during a run."
         try:
-            window.timer.stop()
+            self.window.timer.stop()
         except AttributeError: # timer hasn't been started
             pass
         self.chapter.abort_timer()
 
-    def get_current_time(self) -> str:
-        return self.chapter.get_current_time()
+    def revert_cells(self, cells: list) -> None:
+        """
+        Revert every cell in cells: [(column, row), ...] to previously held data, like an undo, and redraw them all at once.
+        Each column must be 1 or 2 because level and diff cannot be reverted.
+        """
+        self._revert_or_delete_cells(cells, revert=True)
 
-    def revert_cell(self, column: int, row: int) -> None:
-        "Revert cell to previously held data, like an undo. column must be 1 or 2 because level and diff cannot be reverted."
-        self._revert_or_delete_cell(column, row, revert=True)
+    def delete_cells(self, cells: list) -> None:
+        self._revert_or_delete_cells(cells, delete=True)
 
-    def delete_cell(self, column: int, row: int) -> None:
-        self._revert_or_delete_cell(column, row, delete=True)
+    def _revert_or_delete_cells(self, cells: list, revert=False, delete=False) -> None:
+        "Helper method to revert or delete many cells. Only one of revert, delete MUST be True."
+        for column, row in cells:
+            self._revert_or_delete_cell(column, row, revert, delete)
+        # redraw every changed cell and the diffs they touched at once
+        rows = [row for column, row in cells]
+        self.model.cells_changed(min(rows), min(column for column, row in cells), 3, last_row=max(rows))
 
     def _revert_or_delete_cell(self, column: int, row: int, revert=False, delete=False) -> None:
-        "Helper method to revert or delete a cell. Only one of revert, delete MUST be True."
-        try:
-            levelchapter = self.chapter.levels[row]
-        except IndexError: # User tried to revert the full chapter time
-            levelchapter = self.chapter
+        "Helper method to revert or delete a cell without redrawing it. Only one of revert, delete MUST be True."
+        levelchapter = self.model.get_levelchapter(row)
         if column == 1:
             if delete:
                 levelchapter.delete_session_time()
             else:
                 levelchapter.revert_session_time()
-            # draw the new session time to the time column
-            if levelchapter.session_time:
-                self.window.tableWidget.setItem(row, 1, self._make_centered_table_item(levelchapter.pretty_time(levelchapter.session_time)))
-            else:
-                self.window.tableWidget.takeItem(row, 1)
         elif column == 2:
             if delete:
                 levelchapter.delete_personal_best()
             else:
                 levelchapter.revert_personal_best()
-            if levelchapter.personal_best:
-                if getattr(levelchapter, "color_pb", False) and levelchapter.personal_best in levelchapter.color_pb:
-                    self._insert_pb_table_item(row, levelchapter)
-                else: # insert pb time with no color
-                    self.window.tableWidget.setItem(row, 2, self._make_centered_table_item(levelchapter.pretty_time(levelchapter.personal_best)))
-            else:
-                self.window.tableWidget.takeItem(row, 2)
         else:
-            raise Exception(f"Invalid column passed to Qchapter.revert_cell: {(column, row)}")
-        # update the diff no matter which was just changed
-        if (levelchapter.session_time and levelchapter.personal_best) and levelchapter.session_time != levelchapter.personal_best:
-            self.window.tableWidget.setItem(row, 3, self._make_centered_table_item(levelchapter.diff))
-        else:
-            self.window.tableWidget.takeItem(row, 3) # make it blank if session_time or PB are blank or if they're the same.
-
-    def _make_centered_table_item(self, text: str) -> QtWidgets.QTableWidgetItem:
-        "helper method to create a centered item for the TableWidget."
-        item = QtWidgets.QTableWidgetItem(text)
-        item.setTextAlignment(QtCore.Qt.AlignCenter)
-        return item
+            raise Exception(f"Invalid column passed to QChapter.revert_cells or delete_cells: {(column, row)}")
 
-    def _insert_pb_table_item(self, row: int, level: Level or Chapter) -> None:
-        "helper method to create a centered and gold background item and insert it into the TableWidget."
-        # Set a list of PB times to indicate if a PB was set this session.
+    def _color_pb(self, levelchapter: Level or Chapter) -> None:
+        "helper method to remember that levelchapter's personal_best was set this session so the table draws it with a gold background."
+        # Keep a tuple of PB times to indicate if a PB was set this session.
         # This way if you get a PB and then beat it, it'll always show up gold.
         # This ensures that the cell will be colored even if you change chapters or revert back and forth
-        try:
-            if level.personal_best not in level.color_pb:
-                level.color_pb.append(level.personal_best)
-        except AttributeError: # level.color_pb doesn't exist
-            level.color_pb = [level.personal_best]
-        else:
-            level.color_pb = level.color_pb[-2:] # limit this list to 2 items like a deque
-        item = self._make_centered_table_item(level.pretty_time(level.personal_best))
-        item.setBackground(self._pb_color)
-        self.window.tableWidget.setItem(row, 2, item)
+        if levelchapter.personal_best not in levelchapter.color_pb:
+            levelchapter.color_pb = (levelchapter.color_pb + (levelchapter.personal_best,))[-2:] # limit this to 2 items like a deque
 
 
 class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
@@ -777,16 +978,23 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
         super(MainWindow, self).__init__()
         # Initialize default gui
         self.setupUi(self)
-        #self.tableWidget.setHorizontalHeaderLabels(["Level", "Time", "PB", "Diff"]) # changed to specifying these in mainwindow.ui
+        self.chapter_model = ChapterTableModel(self) # the headers are set by ChapterTableModel.headerData
+        self.tableWidget.setModel(self.chapter_model)
         self.tableWidget.horizontalHeader().setSectionResizeMode(0, QtWidgets.QHeaderView.Stretch)
+        # Every row is the same height, so don't let rows be resized one at a time and the header never has to track different sizes
+        self.tableWidget.verticalHeader().setSectionResizeMode(QtWidgets.QHeaderView.Fixed)
         self.comboBox_category.addItems(RecordHolder.categories)
         self.comboBox_category.setFocus()
         self.comboBox_difficulty.addItems(RecordHolder.difficulties)
         self.comboBox_chapter.addItems(RecordHolder.chapter_names)
+        self._comboboxes = (self.comboBox_category, self.comboBox_difficulty, self.comboBox_chapter)
         self.action_revert = QtWidgets.QAction(self.style().standardIcon(QtWidgets.QStyle.SP_DialogResetButton), "&Revert", self)
         self.action_delete = QtWidgets.QAction(self.style().standardIcon(QtWidgets.QStyle.SP_TrashIcon), "&Delete", self)
-        for attr in self.action_revert, self.action_delete:
+        self._cell_actions = (self.action_revert, self.action_delete) # the context menu actions for the selected cells
+        for attr in self._cell_actions:
             self.tableWidget.addAction(attr)
+            attr.setDisabled(True) # nothing is selected yet
+        self._selection_valid = False # whether the selected cells can be reverted or deleted, see table_selection_changed
         self.toolButton_help.setIcon(self.style().standardIcon(QtWidgets.QStyle.SP_DialogHelpButton))
 
         # set up the main logic
@@ -798,13 +1006,21 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
             self.statusbar.showMessage("Ready.")
         self.record_holder = RecordHolder(serialized_db)
 
+        # Changing the comboboxes reloads the table through this timer, so changing several of them at once only reloads it once.
+        self._reload_timer = QtCore.QTimer(self)
+        self._reload_timer.setSingleShot(True)
+        self._reload_timer.setInterval(0) # as soon as we're back in the event loop
+        self._reload_timer.timeout.connect(self._reload_table)
+        self._qchapter_cache = {} # {(category, difficulty, chapter_name): QChapter} so switching back to a chapter reuses it
+        self._timer_active = False # whether a level is being timed, so the lcd knows whether to keep counting
+
         # set gui to be as it was when last run
         if gui_config := self.file_dude.get_gui_config():
             self.comboBox_category.setCurrentText(gui_config["category"])
             self.comboBox_difficulty.setCurrentText(gui_config["difficulty"])
             self.comboBox_chapter.setCurrentText(gui_config["chapter_name"])
             self.resize(*gui_config["window_size"])
-            self.comboBox_changed() # load the table
+            self._reload_table() # load the table, the comboboxes aren't connected yet so this is the only time it's loaded
 
         # connect signals and slots
         self.comboBox_category.currentIndexChanged.connect(self.comboBox_changed)
@@ -813,7 +1029,8 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
         self.pushButton_gzdoom.pressed.connect(self.start_gzdoom_pressed)
         self.action_revert.triggered.connect(self.revert_clicked)
         self.action_delete.triggered.connect(self.delete_clicked)
-        self.tableWidget.itemSelectionChanged.connect(self.table_selection_changed)
+        self.tableWidget.selectionModel().selectionChanged.connect(self.table_selection_changed)
+        self.chapter_model.modelReset.connect(self.table_selection_changed) # changing chapters clears the selection without a selectionChanged
         self.toolButton_help.clicked.connect(self.help_clicked)
 
         self.start_gzdoom_pressed()
@@ -822,38 +1039,41 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
     def level_started(self, level_info: dict) -> None:
         "This is called when a new level is started in gzdoom."
         # First take a snapshot of the time before we do any further processing
-        self.timer_start_time = datetime.now()
-        while True:
-            try: # start the level's timer
-                self.qchapter.start_timer(self.timer_start_time, level_info["code"])
-            except WrongChapter: # The chapter combobox doesn't match the level, so change the combobox to match. Loop and try again.
-                self._set_chapter_combobox_by_code(level_info["code"])
-            except AttributeError: # self.qchapter not set because a level was started without a category or difficulty set
-                if not hasattr(self, "qchapter"):
-                    missing = [] # find out what we're missing.
-                    if not self.comboBox_category.currentText():
-                        missing.append("category")
-                    if not self.comboBox_difficulty.currentText():
-                        if missing:
-                            missing.append("and")
-                        missing.append("difficulty")
-                    if not missing: # if category and difficulty are set, just change the chapter to what it should be
-                        self._set_chapter_combobox_by_code(level_info["code"])
-                        continue
-                    elif len(missing) == 1:
-                        missing.append("is")
-                    else:
-                        missing.append("are")
-                    self.statusbar.showMessage(f"Not recording time because {' '.join(missing)} not set.")
-                    return
-                else:
-                    raise
-            else:
-                break
+        # perf_counter_ns is a monotonic clock that's cheap to read and isn't thrown off by the system clock changing mid run
+        self.timer_start_ns = perf_counter_ns()
+        if level_info["code"] not in _LEVEL_META: # a level from a wad or episode that isn't part of doom or doom 2
+            self.statusbar.showMessage(f"Not recording time because {level_info['code']} {level_info['name']} is not a level this timer tracks.")
+            return
+        # Don't record anything if we don't know what category or difficulty this run is for
+        missing = [] # find out what we're missing.
+        if not self.comboBox_category.currentText():
+            missing.append("category")
+        if not self.comboBox_difficulty.currentText():
+            if missing:
+                missing.append("and")
+            missing.append("difficulty")
+        if missing:
+            missing.append("is" if len(missing) == 1 else "are")
+            self.statusbar.showMessage(f"Not recording time because {' '.join(missing)} not set.")
+            return
+        # Change the chapter combobox to match the level if it doesn't already, and only reload the table once for it
+        chapter_name = RecordHolder.get_chapter_name_by_code(level_info["code"])
+        # A combobox change earlier in this event loop turn may still have a reload waiting, do it now so the timer starts on the right chapter.
+        if self._reload_timer.isActive() or self.comboBox_chapter.currentText() != chapter_name or not hasattr(self, "qchapter"):
+            self.comboBox_chapter.blockSignals(True)
+            self._set_chapter_combobox_by_code(level_info["code"])
+            self.comboBox_chapter.blockSignals(False)
+            self._reload_table()
+        # start the level's timer
+        self.qchapter.start_timer(self.timer_start_ns, level_info["code"])
+        self._timer_active = True
         # Set up the lcdNumber timer
+        self._lcd_time = None # the time the lcdNumber is showing
         self.timer = QtCore.QTimer(self)
         self.timer.timeout.connect(self.lcd_timer_expired)
-        self.timer.start(10)
+        # This is only for looks, the recorded time doesn't depend on it. About 30 updates a second looks smooth enough,
+        # and the default coarse timer type lets Qt line it up with other timers.
+        self.timer.start(33)
 
         self.statusbar.showMessage(f"New level started: {level_info['code']} {level_info['name']}")
         self._comboboxes_enabled(False) # don't allow changes while a run is in progress.
@@ -861,12 +1081,15 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
     @QtCore.pyqtSlot()
     def level_finished(self) -> None:
         "This is called when a level ends in gzdoom."
-        stop_time = datetime.now()
-        if hasattr(self, "qchapter"):
+        stop_ns = perf_counter_ns()
+        if self._timer_active:
+            self._timer_active = False
             self.timer.stop()
-            self.qchapter.stop_timer(stop_time)
-        else:
+            if self.qchapter.stop_timer(stop_ns): # save new personal bests right away so they survive a crash
+                self.file_dude.save_async(self.record_holder.dump_database(), self.get_gui_config())
+        elif not hasattr(self, "qchapter"):
             self.statusbar.showMessage("Level finished with no recording because category or difficulty is not set.")
+        # else the level wasn't timed and level_started already said why
         self._comboboxes_enabled(True)
 
     @QtCore.pyqtSlot()
@@ -893,7 +1116,7 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
         self.pushButton_gzdoom.setEnabled(True)
         status_msg = "gzdoom exited."
         self.pushButton_gzdoom.setToolTip("Gzdoom is running.")
-        if not self.comboBox_category.isEnabled(): # poor man's check if timer is running
+        if self._timer_active:
             self._abort_timer(status_msg)
         else:
             self.statusbar.showMessage(status_msg)
@@ -906,46 +1129,61 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
     @QtCore.pyqtSlot()
     def lcd_timer_expired(self) -> None:
         "The very short timer has expired, so update the lcdNumber."
-        try:
-            self.lcdNumber.display(self.qchapter.get_current_time())
-        except RuntimeError: # tried to get the current time after a level has ended
+        if not self._timer_active: # a tick that arrived after the level ended
             return
+        current_time = _fast_pretty_centi(perf_counter_ns() - self.timer_start_ns)
+        # The lcd only shows hundredths of a second so most ticks show the same thing, don't repaint it unless it changed.
+        if current_time != self._lcd_time:
+            self._lcd_time = current_time
+            self.lcdNumber.display(current_time)
 
     def get_gui_config(self) -> dict:
         "return the current state of the gui so it can be saved to disk on exit."
         return {"category": self.comboBox_category.currentText(),
                 "difficulty": self.comboBox_difficulty.currentText(),
                 "chapter_name": self.comboBox_chapter.currentText(),
-                "window_size": (self.frameGeometry().width(), self.frameGeometry().height())}
+                "window_size": [self.frameGeometry().width(), self.frameGeometry().height()]} # a list to match what's loaded from json
 
     @QtCore.pyqtSlot()
     def comboBox_changed(self) -> None:
-        "One of the comboBoxes has been changed, reload the table."
+        "One of the comboBoxes has been changed, reload the table once any other changes happening with it are done."
+        self._reload_timer.start() # restarting it while it's already waiting doesn't add another reload
+
+    def _reload_table(self) -> None:
+        "Helper method to show the chapter the comboBoxes are set to in the table right away."
+        self._reload_timer.stop() # in case a reload was waiting, this is it
+        key = (self.comboBox_category.currentText(), self.comboBox_difficulty.currentText(), self.comboBox_chapter.currentText())
         try:
-            self.qchapter = QChapter(self.record_holder.get_chapter(self.comboBox_category.currentText(), self.comboBox_difficulty.currentText(), self.comboBox_chapter.currentText()), self)
-        except KeyError: # One combobox was changed while the others were blank
-            return
+            qchapter = self._qchapter_cache[key]
+        except KeyError: # first time this chapter is shown
+            try:
+                qchapter = self._qchapter_cache[key] = QChapter(self.record_holder.get_chapter(*key), self)
+            except KeyError: # One combobox was changed while the others were blank
+                return
+        else:
+            if qchapter is getattr(self, "qchapter", None): # it's already in the table
+                return
+            qchapter.show_in_table()
+        self.qchapter = qchapter
 
     @QtCore.pyqtSlot()
     def revert_clicked(self) -> None:
         "The revert context menu was clicked in a cell."
-        for cell in self._get_selected_cells():
-            self.qchapter.revert_cell(*cell)
+        self.qchapter.revert_cells(self._get_selected_cells())
 
     @QtCore.pyqtSlot()
     def delete_clicked(self) -> None:
         "The delete context menu was clicked in a cell."
-        for cell in self._get_selected_cells():
-            self.qchapter.delete_cell(*cell)
+        self.qchapter.delete_cells(self._get_selected_cells())
 
     @QtCore.pyqtSlot()
     def table_selection_changed(self) -> None:
-        if self._get_selected_cells() is None:
-            self.action_revert.setDisabled(True)
-            self.action_delete.setDisabled(True)
-        else:
-            self.action_revert.setDisabled(False)
-            self.action_delete.setDisabled(False)
+        "Enable or disable the context menu depending on what's selected, but only touch the actions when that changes."
+        selection_valid = self._get_selected_cells() is not None
+        if selection_valid != self._selection_valid:
+            self._selection_valid = selection_valid
+            for attr in self._cell_actions:
+                attr.setDisabled(not selection_valid)
 
     @QtCore.pyqtSlot()
     def help_clicked(self) -> None:
@@ -977,6 +1215,10 @@ Arguments given to this program will be passed onto gzdoom, but don't change the
 
     def _abort_timer(self, status_msg: str) -> None:
         "helper method to abort a run in progress and show a statusbar message."
+        if not self._timer_active: # nothing is being timed, like a level we don't keep times for, so leave the chapter alone
+            self.statusbar.showMessage(status_msg)
+            return
+        self._timer_active = False
         self.timer.stop()
         self.qchapter.abort_timer()
         self._comboboxes_enabled(True)
@@ -988,24 +1230,20 @@ Arguments given to this program will be passed onto gzdoom, but don't change the
 
     def _comboboxes_enabled(self, state: bool) -> None:
         "Set the category, difficulty, and chapter combobox enabled state."
-        for attr in self.comboBox_category, self.comboBox_difficulty, self.comboBox_chapter:
+        for attr in self._comboboxes:
             attr.setEnabled(state)
 
     def _get_selected_cells(self) -> list or None:
         """
         Helper method to return a list of every currently selected cell: [(1, 1), ...]
-        Return None if an invalid cell is selected.
+        Return None if nothing or an invalid cell is selected.
         The first and last columns are invalid; you can't revert or delete the level name or diff.
         """
-        result = []
-        for selected_range in self.tableWidget.selectedRanges():
-            for column in range(selected_range.leftColumn(), selected_range.rightColumn()+1):
-                for row in range(selected_range.topRow(), selected_range.bottomRow()+1):
-                    if 0 < column < 3:
-                        result.append((column, row))
-                    else:
-                        return None
-        return result
+        indexes = self.tableWidget.selectionModel().selectedIndexes()
+        if not indexes:
+            return None
+        result = [(index.column(), index.row()) for index in indexes]
+        return result if all(0 < column < 3 for column, row in result) else None
 
 
 if __name__ == '__main__':
@@ -1015,3 +1253,4 @@ if __name__ == '__main__':
     window.show()
     app.exec()
     window.file_dude.save(window.record_holder.dump_database(), window.get_gui_config())
+    window.file_dude.close()
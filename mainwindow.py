@@ -66,42 +66,12 @@ class Ui_MainWindow(object):
         self.comboBox_chapter.setObjectName("comboBox_chapter")
         self.horizontalLayout.addWidget(self.comboBox_chapter)
         self.verticalLayout_2.addLayout(self.horizontalLayout)
-        self.tableWidget = QtWidgets.QTableWidget(self.centralwidget)
+        self.tableWidget = QtWidgets.QTableView(self.centralwidget)
         self.tableWidget.setContextMenuPolicy(QtCore.Qt.ActionsContextMenu)
         self.tableWidget.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
         self.tableWidget.setProperty("showDropIndicator", False)
         self.tableWidget.setAlternatingRowColors(True)
-        self.tableWidget.setRowCount(0)
-        self.tableWidget.setColumnCount(4)
         self.tableWidget.setObjectName("tableWidget")
-        item = QtWidgets.QTableWidgetItem()
-        font = QtGui.QFont()
-        font.setPointSize(14)
-        font.setBold(True)
-        font.setWeight(75)
-        item.setFont(font)
-        self.tableWidget.setHorizontalHeaderItem(0, item)
-        item = QtWidgets.QTableWidgetItem()
-        font = QtGui.QFont()
-        font.setPointSize(14)
-        font.setBold(True)
-        font.setWeight(75)
-        item.setFont(font)
-        self.tableWidget.setHorizontalHeaderItem(1, item)
-        item = QtWidgets.QTableWidgetItem()
-        font = QtGui.QFont()
-        font.setPointSize(14)
-        font.setBold(True)
-        font.setWeight(75)
-        item.setFont(font)
-        self.tableWidget.setHorizontalHeaderItem(2, item)
-        item = QtWidgets.QTableWidgetItem()
-        font = QtGui.QFont()
-        font.setPointSize(14)
-        font.setBold(True)
-        font.setWeight(75)
-        item.setFont(font)
-        self.tableWidget.setHorizontalHeaderItem(3, item)
         self.verticalLayout_2.addWidget(self.tableWidget)
         MainWindow.setCentralWidget(self.centralwidget)
         self.statusbar = QtWidgets.QStatusBar(MainWindow)
@@ -123,15 +93,4 @@ class Ui_MainWindow(object):
         self.comboBox_difficulty.setPlaceholderText(_translate("MainWindow", "Difficulty"))
         self.comboBox_chapter.setToolTip(_translate("MainWindow", "Doom Chapter."))
         self.comboBox_chapter.setPlaceholderText(_translate("MainWindow", "Doom Chapter"))
-        item = self.tableWidget.horizontalHeaderItem(0)
-        item.setText(_translate("MainWindow", "Level"))
-        item = self.tableWidget.horizontalHeaderItem(1)
-        item.setText(_translate("MainWindow", "Time"))
-        item.setToolTip(_translate("MainWindow", "Your best time since starting this app."))
-        item = self.tableWidget.horizontalHeaderItem(2)
-        item.setText(_translate("MainWindow", "PB"))
-        item.setToolTip(_translate("MainWindow", "Your all-time personal best"))
-        item = self.tableWidget.horizontalHeaderItem(3)
-        item.setText(_translate("MainWindow", "Diff"))
-        item.setToolTip(_translate("MainWindow", "The difference between your time and personal best."))
 import resources_rc